@@ -17,7 +17,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from argrecord import ArgumentHelper, ArgumentRecorder
-import requests
 import re
 from dateutil import parser as dateparser
 import sys
@@ -25,16 +24,12 @@ import os
 import shutil
 import csv
 import string
-from bs4 import BeautifulSoup
 from io import BytesIO, TextIOWrapper
 from zipfile import ZipFile
 
 from collections import OrderedDict
 import itertools
 
-from sqlalchemy import *
-from sqlalchemy import exc
-
 def bomDailyRailfall(arglist=None):
 
     parser = ArgumentRecorder(description='Output BOM daily rainfall data to CSV or database.',
@@ -58,6 +53,8 @@ def bomDailyRailfall(arglist=None):
 
     incomments = ''
     if "://" in args.sites:       # Database
+        from sqlalchemy import create_engine, MetaData, Table, Column, String, Integer, Date, Float, and_, bindparam, exc
+
         outfile = None
         bomdb = create_engine(args.sites)
         bomcon = bomdb.connect()
@@ -170,6 +167,10 @@ def evalfilter(" + ','.join(columns) + ",**kwargs):\n\
 
         bomtr = bomcon.begin()
 
+    if not args.dry_run:
+        import requests
+        from bs4 import BeautifulSoup
+
     for site in sites:
 
         if args.verbosity >= 1:
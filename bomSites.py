@@ -17,7 +17,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from argrecord import ArgumentHelper, ArgumentRecorder
-import requests
 import re
 from dateutil import parser as dateparser
 from datetime import datetime
@@ -26,8 +25,6 @@ import os
 import shutil
 import csv
 import string
-from sqlalchemy import *
-from sqlalchemy import exc
 
 def bomSites(arglist=None):
 
@@ -51,6 +48,8 @@ def bomSites(arglist=None):
         bomdb = None
         logfilename = None
     elif "://" in args.outdata:    # Database
+        from sqlalchemy import create_engine, MetaData, Table, Column, String, Integer, Date, Float, Boolean, exc
+
         outfile = None
         bomdb = create_engine(args.outdata)
         logfilename = args.outdata.split('/')[-1].rsplit('.',1)[0] + '.log'
@@ -76,6 +75,8 @@ def bomSites(arglist=None):
     if args.verbosity >= 1:
         print("Loading BOM data.", file=sys.stderr)
 
+    import requests
+
     reqlines = requests.get('http://www.bom.gov.au/climate/data/lists_by_element/alpha' + args.state + '_136.txt', stream=True).iter_lines(decode_unicode=True)
 
     firstline = next(reqlines)
@@ -90,25 +91,25 @@ def bomSites(arglist=None):
     fields[-1] += (None,)
     dummyline   = next(reqlines)
 
-    def str2bool(v):
-        return v.lower() in ("yes", "true", "t", "1")
-
-    def partdate(v):
-        return dateparser.parse(v, default=datetime(1,1,1))
-
-    fieldtype = {
-        'Site':  ('Site',    Integer,    int),
-        'Name':  ('Name',    String(32), str.strip),
-        'Lat':   ('Lat',     Float,      float),
-        'Lon':   ('Lon',     Float,      float),
-        'Start': ('Start',   Date,       partdate),
-        'End':   ('End',     Date,       partdate),
-        'Years': ('Years',   Float,      float),
-        '%':     ('Percent', Integer,    int),
-        'AWS':   ('AWS',     Boolean,    str2bool)
-    }
-
     if bomdb:    # Database
+        def str2bool(v):
+            return v.lower() in ("yes", "true", "t", "1")
+
+        def partdate(v):
+            return dateparser.parse(v, default=datetime(1,1,1))
+
+        fieldtype = {
+            'Site':  ('Site',    Integer,    int),
+            'Name':  ('Name',    String(32), str.strip),
+            'Lat':   ('Lat',     Float,      float),
+            'Lon':   ('Lon',     Float,      float),
+            'Start': ('Start',   Date,       partdate),
+            'End':   ('End',     Date,       partdate),
+            'Years': ('Years',   Float,      float),
+            '%':     ('Percent', Integer,    int),
+            'AWS':   ('AWS',     Boolean,    str2bool)
+        }
+
         bomcon = bomdb.connect()
         bomtr = bomcon.begin()
         bommd = MetaData(bind=bomdb)
@@ -139,9 +140,11 @@ def bomSites(arglist=None):
         bomdb.dispose()
 
     else:
+        fieldname = { '%': 'Percent' }
+
         outcsv=csv.writer(outfile)
         if not args.no_header:
-            outcsv.writerow([fieldtype[field[0]][0] for field in fields])
+            outcsv.writerow([fieldname.get(field[0], field[0]) for field in fields])
         inrowcount = 0
         while True:
             if args.limit and inrowcount == args.limit:
@@ -24,9 +24,6 @@ import os
 import shutil
 import csv
 import re
-import cartopy
-from matplotlib import pyplot, tri
-import numpy
 
 def contourRainfall(arglist=None):
 
@@ -41,6 +38,8 @@ def contourRainfall(arglist=None):
     parser.add_argument(      '--since',      type=str, help='Start date to produce contour from')
     parser.add_argument(      '--until',      type=str, help='End date to produce contour from')
 
+    parser.add_argument(      '--cube',       type=str, help='Rainfall cube data file (see rainfallCube.py) to read site data from instead of per-site delta files', input=True)
+
     parser.add_argument('--outfile',          type=str, help='Output image file', output=True)
     parser.add_argument('--logfile',          type=str, help='Log file to record plot, default is <outfile>.log')
     parser.add_argument('--no-comments',      action='store_true', help='Do not produce a comments logfile')
@@ -92,17 +91,31 @@ def evalfilter(" + ','.join([clean(fieldname) for fieldname in infieldnames]) +
 
         sites += [row]
 
+    if args.cube:
+        import numpy
+        from rainfallCube import loadRainfallCube, dayIndex
+
+        cube, cubesites, cubedates = loadRainfallCube(args.cube)
+        cubeindex = {cubesite['Site']: index for index, cubesite in enumerate(cubesites)}
+        firstday = max(dayIndex(since), 0) if since else 0
+        lastday  = max(dayIndex(until), 0) if until else cube.shape[1]
+
     xdata = []
     ydata = []
     textdata = []
     zdata = []
     for site in sites:
+        zvalue = None
         sitefilename = site['Name'] + '_delta.csv'
-        if os.path.isfile(sitefilename):
+        if args.cube:
+            if site['Site'] in cubeindex:
+                window = cube[cubeindex[site['Site']], firstday:lastday]
+                if not numpy.isnan(window).all():
+                    zvalue = float(numpy.nansum(window, dtype=numpy.float64))
+        elif os.path.isfile(sitefilename):
             if args.verbosity >= 2:
                 print("Opening site data file: " + sitefilename, file=sys.stderr)
             sitefile = open(sitefilename, 'r')
-            zvalue = None
             for row in csv.DictReader(filter(lambda line: line[0]!='#', sitefile)):
                 date = datetime.date(year=int(row['Year']), month=int(row['Month']), day=int(row['Day']))
                 if until and date >= until:
@@ -112,13 +125,17 @@ def evalfilter(" + ','.join([clean(fieldname) for fieldname in infieldnames]) +
 
                 zvalue = (zvalue or 0) + float(row['Delta'])
 
-            if zvalue:
-                if args.verbosity >= 2:
-                    print("Adding data for site: " + site['Name'], file=sys.stderr)
-                xdata += [float(site['Lon'])]
-                ydata += [float(site['Lat'])]
-                textdata += [site['Name']]
-                zdata += [zvalue]
+        if zvalue:
+            if args.verbosity >= 2:
+                print("Adding data for site: " + site['Name'], file=sys.stderr)
+            xdata += [float(site['Lon'])]
+            ydata += [float(site['Lat'])]
+            textdata += [site['Name']]
+            zdata += [zvalue]
+
+    import cartopy
+    from matplotlib import pyplot, tri
+    import numpy
 
     xi = numpy.linspace(min(xdata), max(xdata), 100)
     yi = numpy.linspace(min(ydata), max(ydata), 100)
@@ -23,7 +23,6 @@ import sys
 import os
 import shutil
 import csv
-from matplotlib import pyplot
 
 def plotAverageRainfall(arglist=None):
 
@@ -80,6 +79,8 @@ def plotAverageRainfall(arglist=None):
         cumulative += y
         cumulativedata += [cumulative]
 
+    from matplotlib import pyplot
+
     fig, ax1 = pyplot.subplots()
     pyplot.title(args.infile.replace("_delta.csv", ""))
     ax2 = ax1.twinx()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2019 Jonathan Schultz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argrecord
+import datetime
+from dateutil import parser as dateparser
+import sys
+import os
+import shutil
+import csv
+import re
+
+# The cube is a dense float32 array of stations x days since EPOCH, stored in
+# column-major order so that each day's values for all stations are contiguous
+# and new days can be appended to the end of the file. Missing values are NaN.
+# Station metadata and the date axis are stored in CSV sidecar files:
+#
+#     <cube>.dat          raw float32 data
+#     <cube>_sites.csv    station metadata, one row per station in cube order
+#     <cube>_dates.csv    date axis, one row per day in cube order
+#
+# The date axis is written after the data and records the days that have been
+# committed. If an append is interrupted, loading the cube fails until the next
+# append, which truncates the data back to the date axis before extending it.
+
+EPOCH = datetime.date(1850, 1, 1)
+
+def cubeFilenames(datafilename):
+    base = datafilename[:-4] if datafilename.endswith('.dat') else datafilename
+    return base + '_sites.csv', base + '_dates.csv', base + '.log'
+
+def dayIndex(date):
+    return (date - EPOCH).days
+
+def dateAxisDays(datesfilename):
+    """Return the number of days recorded in a cube's date axis, checking that
+       the last row is the date expected for that many days."""
+    lines = open(datesfilename, 'r').read().splitlines()
+    days = len(lines) - 1
+    if days > 0:
+        year, month, day = next(csv.reader([lines[-1]]))
+        if datetime.date(year=int(year), month=int(month), day=int(day)) != EPOCH + datetime.timedelta(days=days - 1):
+            raise RuntimeError("Date axis " + datesfilename + " does not end on the expected date")
+
+    return days
+
+def loadRainfallCube(datafilename, mode='r'):
+    """Memory-map a rainfall cube, returning the (stations x days) array, the
+       list of station metadata rows and the date axis as numpy datetime64."""
+    import numpy
+
+    sitesfilename, datesfilename, logfilename = cubeFilenames(datafilename)
+    sites = list(csv.DictReader(open(sitesfilename, 'r')))
+    days = os.path.getsize(datafilename) // (4 * len(sites))
+    if dateAxisDays(datesfilename) != days:
+        raise RuntimeError("Date axis " + datesfilename + " does not match cube " + datafilename + ", run --append to recover")
+
+    data = numpy.memmap(datafilename, dtype=numpy.float32, mode=mode, shape=(len(sites), days), order='F')
+    dates = numpy.datetime64(EPOCH, 'D') + numpy.arange(days)
+
+    return data, sites, dates
+
+def rainfallCube(arglist=None):
+
+    parser = argrecord.ArgumentRecorder(description='Build or extend a memory-mapped station x day rainfall cube from per-site CSV files.',
+                                        fromfile_prefix_chars='@')
+
+    parser.add_argument('-v', '--verbosity',  type=int, default=1, private=True)
+
+    parser.add_argument('-f', '--filter',     type=str, help='Python expression evaluated to determine whether site is included')
+
+    parser.add_argument(      '--suffix',     type=str, default='_delta.csv', help='Suffix appended to site name to give site data file, default is "_delta.csv"')
+    parser.add_argument(      '--column',     type=str, default='Delta', help='Column of site data file to store in cube, default is "Delta"')
+
+    parser.add_argument(      '--since',      type=str, help='With --append, date from which to refill existing days, default is end of cube')
+    parser.add_argument(      '--until',      type=str, help='End date (exclusive) of cube, default is today')
+
+    parser.add_argument(      '--append',     action='store_true', help='Extend an existing cube with new days instead of building a new one')
+
+    parser.add_argument('--outfile',          type=str, required=True, help='Cube data file, for example "WA_cube.dat"', output=True)
+    parser.add_argument('--logfile',          type=str, help='Log file to record cube, default is <outfile> with .log extension')
+    parser.add_argument('--no-comments',      action='store_true', help='Do not produce a comments logfile')
+
+    parser.add_argument('infile',             type=str, nargs='?', help='Site CSV file, not used with --append', input=True)
+
+    args = parser.parse_args(arglist)
+
+    if not args.append and not args.infile:
+        parser.error('infile is required unless --append is specified')
+
+    import numpy
+
+    datafilename = args.outfile
+    sitesfilename, datesfilename, logfilename = cubeFilenames(datafilename)
+    logfilename = args.logfile or logfilename
+
+    until = dateparser.parse(args.until).date() if args.until else datetime.date.today()
+    since = dateparser.parse(args.since).date() if args.since else None
+
+    if not args.append and dayIndex(until) <= 0:
+        parser.error('--until must be after ' + EPOCH.isoformat())
+
+    if args.append:
+        sites = list(csv.DictReader(open(sitesfilename, 'r')))
+
+        # Discard any data beyond the date axis left by an interrupted append.
+        olddays = dateAxisDays(datesfilename)
+        if os.path.getsize(datafilename) < len(sites) * olddays * 4:
+            raise RuntimeError("Cube " + datafilename + " is shorter than date axis " + datesfilename)
+        os.truncate(datafilename, len(sites) * olddays * 4)
+
+        incomments = open(logfilename, 'r').read() if os.path.isfile(logfilename) else argrecord.ArgumentHelper.separator()
+        startday = min(max(dayIndex(since), 0), olddays) if since else olddays
+    else:
+        # Read comments at start of infile.
+        infile = open(args.infile, 'r')
+        incomments = argrecord.ArgumentHelper.read_comments(infile) or argrecord.ArgumentHelper.separator()
+        infieldnames = next(csv.reader([next(infile)]))
+        inreader=csv.DictReader(infile, fieldnames=infieldnames)
+
+        def clean(v):
+            return re.sub(r'\W|^(?=\d)','_', v)
+
+        if args.filter:
+            exec("\
+def evalfilter(" + ','.join([clean(fieldname) for fieldname in infieldnames]) + ",**kwargs):\n\
+    return " + args.filter, globals())
+
+        sites = []
+        for row in inreader:
+            keep = True
+            if args.filter:
+                rowargs = {clean(item[0]): item[1] for item in row.items()}
+                keep = evalfilter(**rowargs) or False
+            if not keep:
+                continue
+
+            sites += [row]
+
+        if not sites:
+            raise RuntimeError("No sites selected")
+
+        olddays = 0
+        startday = 0
+
+    if not args.no_comments:
+        parser.write_comments(args, logfilename, incomments=incomments)
+
+    days = max(dayIndex(until), olddays)
+    if args.verbosity >= 1:
+        print("Cube has " + str(len(sites)) + " sites and " + str(days) + " days.", file=sys.stderr)
+
+    if args.append:
+        if days > olddays:
+            with open(datafilename, 'ab') as datafile:
+                numpy.full(len(sites) * (days - olddays), numpy.nan, dtype=numpy.float32).tofile(datafile)
+
+        cube = numpy.memmap(datafilename, dtype=numpy.float32, mode='r+', shape=(len(sites), days), order='F')
+    else:
+        for filename in (datafilename, sitesfilename, datesfilename):
+            if os.path.exists(filename):
+                shutil.move(filename, filename + '.bak')
+
+        cube = numpy.memmap(datafilename, dtype=numpy.float32, mode='w+', shape=(len(sites), days), order='F')
+        cube[:] = numpy.nan
+
+        sitesfile = open(sitesfilename, 'w')
+        sitescsv = csv.DictWriter(sitesfile, fieldnames=infieldnames)
+        sitescsv.writeheader()
+        sitescsv.writerows(sites)
+        sitesfile.close()
+
+    for index, site in enumerate(sites):
+        sitefilename = site['Name'] + args.suffix
+        if not os.path.isfile(sitefilename):
+            if args.verbosity >= 1:
+                print("Site data file not found: " + sitefilename, file=sys.stderr)
+            continue
+
+        if args.verbosity >= 2:
+            print("Opening site data file: " + sitefilename, file=sys.stderr)
+        sitedata = numpy.full(days - startday, numpy.nan, dtype=numpy.float32)
+        sitefile = open(sitefilename, 'r')
+        for row in csv.DictReader(filter(lambda line: line[0]!='#', sitefile)):
+            if not row[args.column]:
+                continue
+
+            day = dayIndex(datetime.date(year=int(row['Year']), month=int(row['Month']), day=int(row['Day'])))
+            if day >= days or day < startday:
+                continue
+
+            sitedata[day - startday] = float(row[args.column])
+
+        sitefile.close()
+
+        cube[index, startday:days] = sitedata
+
+    cube.flush()
+    del cube
+
+    datesfile = open(datesfilename, 'a' if args.append else 'w')
+    datescsv = csv.writer(datesfile)
+    if not args.append:
+        datescsv.writerow(['Year', 'Month', 'Day'])
+    for day in range(olddays, days):
+        date = EPOCH + datetime.timedelta(days=day)
+        datescsv.writerow([date.year, date.month, date.day])
+    datesfile.close()
+
+    exit(0)
+
+if __name__ == '__main__':
+    rainfallCube(None)
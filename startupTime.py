@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2019 Jonathan Schultz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import sys
+import os
+import subprocess
+import tempfile
+import time
+import re
+
+heavymodules = ['requests', 'bs4', 'sqlalchemy', 'matplotlib', 'cartopy', 'numpy']
+
+commands = [
+    ['bomSites.py', '--help'],
+    ['bomDailyRainfall.py', '--help'],
+    ['bomDailyRainfall.py', '--dry-run', '--no-comments', '--verbosity', '0', '--sites', '{sites}'],
+    ['contourRainfall.py', '--help'],
+    ['plotAverageRainfall.py', '--help'],
+    ['rainfallCube.py', '--help'],
+]
+
+def runCommand(scriptdir, command, sites, repeat):
+    script = os.path.join(scriptdir, command[0])
+    if not os.path.isfile(script):
+        return None
+
+    argv = [sys.executable, '-X', 'importtime', script] + [arg.format(sites=sites) for arg in command[1:]]
+    walltimes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+        walltimes += [time.perf_counter() - start]
+        if result.returncode != 0:
+            return result.returncode, None, None, None
+
+    importtime = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)', line)
+        if match:
+            if not match.group(2):
+                importtime += int(match.group(1))
+            imported.add(match.group(3).split('.')[0])
+
+    return 0, min(walltimes), importtime / 1000000, [module for module in heavymodules if module in imported]
+
+def startupTime(arglist=None):
+
+    parser = argparse.ArgumentParser(description='Measure startup time of the scripts using python -X importtime.')
+
+    parser.add_argument('-r', '--repeat',     type=int, default=5, help='Number of runs of each command, fastest is reported')
+    parser.add_argument('-b', '--baseline',   type=str, help='Git revision to compare against, for example "HEAD~1"')
+
+    args = parser.parse_args(arglist)
+
+    scriptdir = os.path.dirname(os.path.abspath(__file__))
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        sites = os.path.join(tempdir, 'sites.csv')
+        with open(sites, 'w') as sitesfile:
+            sitesfile.write('Site,Name,Lat,Lon\n9999,TEST,-34.0,116.0\n')
+
+        if args.baseline:
+            basedir = os.path.join(tempdir, 'baseline')
+            os.mkdir(basedir)
+            for script in set(command[0] for command in commands):
+                result = subprocess.run(['git', '-C', scriptdir, 'show', args.baseline + ':' + script], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                if result.returncode == 0:
+                    with open(os.path.join(basedir, script), 'wb') as scriptfile:
+                        scriptfile.write(result.stdout)
+
+        for command in commands:
+            print(' '.join(command).format(sites='sites.csv'))
+            runs = [('current', scriptdir)] + ([(args.baseline, basedir)] if args.baseline else [])
+            for label, directory in runs:
+                result = runCommand(directory, command, sites, args.repeat)
+                if not result:
+                    continue
+
+                returncode, walltime, importtime, heavy = result
+                if returncode:
+                    print('    {:<12} failed (rc={})'.format(label, returncode))
+                else:
+                    print('    {:<12} wall {:6.3f}s  imports {:6.3f}s  heavy: {}'.format(label, walltime, importtime, ', '.join(heavy) or 'none'))
+
+    exit(0)
+
+if __name__ == '__main__':
+    startupTime(None)